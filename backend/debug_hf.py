@@ -1,5 +1,5 @@
 import os
-import requests
+import httpx
 from dotenv import load_dotenv
 
 # Load env directly to verify what the process sees
@@ -20,7 +20,12 @@ url = f"https://router.huggingface.co/hf-inference/models/{model_id}/v1/chat/com
 
 print(f"\nTarget URL: {url}")
 
-headers = {"Authorization": f"Bearer {api_token}"}
+# Keepalive + HTTP/2 so repeated runs/polling reuse one TLS session
+client = httpx.Client(
+    http2=True,
+    headers={"Authorization": f"Bearer {api_token}"},
+    timeout=10.0,
+)
 payload = {
     "model": model_id,
     "messages": [{"role": "user", "content": "Status check."}],
@@ -29,7 +34,7 @@ payload = {
 
 try:
     print("\nSending request...")
-    response = requests.post(url, headers=headers, json=payload, timeout=10)
+    response = client.post(url, json=payload)
     print(f"Status Code: {response.status_code}")
     print(f"Response: {response.text}")
 except Exception as e:
@@ -1,17 +1,20 @@
 import asyncio
-import json
 import os
-import random
+import re
+from collections import deque
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import numpy as np
+import orjson
 from sklearn.ensemble import IsolationForest
 from rag.config import Settings, get_settings
 from rag.logging import configure_logging, get_logger
 from rag.generation import HFInferenceClient, postprocess_response
+from ml import iforest_scorer
 
 app = FastAPI()
 
@@ -26,13 +29,13 @@ app.add_middleware(
 
 # --- Data Models ---
 
-class SensorData(BaseModel):
-    id: str
-    value: float
-    unit: str
-    status: str  # normal, warning, critical
+# Internal state types: only ever constructed server-side, so slotted
+# dataclasses (orjson serializes them natively) instead of pydantic
+# validation. Pydantic stays on the request/response wire models below.
+# (Sensor records themselves are plain dicts built in update_sensors.)
 
-class AnomalyEvent(BaseModel):
+@dataclass(slots=True)
+class AnomalyEvent:
     zone: str
     severity: float
     timestamp: float
@@ -49,142 +52,120 @@ class RAGChatResponse(BaseModel):
 
 # --- Global State ---
 
+# Sensor order: temperature, pressure, ph, flowRate, vibration
+SENSOR_IDS = ["temperature", "pressure", "ph", "flowRate", "vibration"]
+SENSOR_UNITS = ["°C", "MPa", "pH", "m³/h", "mm/s"]
+SENSOR_LO = np.array([350.0, 2.0, 6.8, 120.0, 0.0])
+SENSOR_HI = np.array([380.0, 2.4, 7.2, 150.0, 10.0])
+SENSOR_NOISE = np.array([0.5, 0.05, 0.05, 2.0, 0.5])
+# Warning thresholds; critical kicks in 5% beyond these
+THRESH_HI = np.array([375.0, 2.35, 7.15, 145.0, 8.0])
+THRESH_LO = np.array([355.0, 2.05, 6.85, 125.0, 0.0])
+STATUS = ("normal", "warning", "critical")
+# Anomaly spikes: +30 on temperature or +0.3 on pressure
+SENSOR_SPIKES = np.array([30.0, 0.3])
+
+rng = np.random.default_rng()
+
 class GlobalState:
-    sensors: Dict[str, SensorData] = {}
-    anomalies: List[AnomalyEvent] = []
+    sensors: Dict[str, dict] = {}
+    values: np.ndarray = np.array([365.0, 2.2, 7.0, 135.0, 2.0], dtype=np.float64)
+    anomalies: deque = deque(maxlen=10)  # AnomalyEvent ring, O(1) eviction
     twin_state: Dict[str, str] = {"core": "normal"}
-    clients: List[WebSocket] = []
-    history: Dict[str, List[float]] = {
-        "temperature": [],
-        "pressure": [],
-        "ph": [],
-        "flowRate": [],
-        "vibration": []
-    }
+    client_queues: Dict[WebSocket, asyncio.Queue] = {}
+    # Ring buffer of the last 50 ticks (rows) x 5 sensors (cols),
+    # written at index data_count % 50
+    history: np.ndarray = np.empty((50, 5), dtype=np.float32)
     model: Optional[IsolationForest] = None
+    packed_forest: Optional[iforest_scorer.PackedForest] = None
     is_model_fitted: bool = False
     data_count: int = 0
     settings: Optional[Settings] = None
     hf_client: Optional[HFInferenceClient] = None
+    redis: Optional[object] = None  # set by simulator.py when publishing
+    init_cache: Optional[bytes] = None
+    init_cache_version: int = -1
 
 state = GlobalState()
 
 # --- Simulation & AI ---
 
-def generate_sensor_value(current: float, min_val: float, max_val: float, noise: float = 0.5) -> float:
-    change = random.uniform(-noise, noise)
-    new_val = current + change
-    return max(min_val, min(new_val, max_val))
-
 async def simulate_sensors():
-    # Initial values
-    temps = 365.0
-    pressure = 2.2
-    ph = 7.0
-    flow = 135.0
-    vibration = 2.0
-
     while True:
         await asyncio.sleep(1)
-        
-        # Random Walk
-        temps = generate_sensor_value(temps, 350, 380, 0.5)
-        pressure = generate_sensor_value(pressure, 2.0, 2.4, 0.05)
-        ph = generate_sensor_value(ph, 6.8, 7.2, 0.05)
-        flow = generate_sensor_value(flow, 120, 150, 2.0)
-        vibration = generate_sensor_value(vibration, 0, 10, 0.5)
-
-        # Anomaly Injection (5% chance)
-        is_anomaly = False
-        if random.random() < 0.05:
-            if random.random() < 0.5:
-                temps += 30  # Spike temp
-            else:
-                pressure += 0.3 # Spike pressure
-            is_anomaly = True
-
-        # Update State
-        update_sensor("temperature", temps, "°C", 375, 355)
-        update_sensor("pressure", pressure, "MPa", 2.35, 2.05)
-        update_sensor("ph", ph, "pH", 7.15, 6.85)
-        update_sensor("flowRate", flow, "m³/h", 145, 125)
-        update_sensor("vibration", vibration, "mm/s", 8, 0)
-
-        # Store history for AI
-        state.history["temperature"].append(temps)
-        state.history["pressure"].append(pressure)
-        state.history["ph"].append(ph)
-        state.history["flowRate"].append(flow)
-        state.history["vibration"].append(vibration)
-        
-        # Keep window size 50
-        for key in state.history:
-            if len(state.history[key]) > 50:
-                state.history[key].pop(0)
 
+        # Random Walk (all 5 sensors in one vectorized step)
+        state.values = np.clip(
+            state.values + rng.uniform(-SENSOR_NOISE, SENSOR_NOISE),
+            SENSOR_LO,
+            SENSOR_HI,
+        )
+
+        # Anomaly Injection (5% chance: spike temp or pressure)
+        if rng.random() < 0.05:
+            idx = rng.integers(0, len(SENSOR_SPIKES))
+            state.values[idx] += SENSOR_SPIKES[idx]
+
+        # Update State (classify all 5 sensors in one comparison pass)
+        update_sensors()
+
+        # Store history for AI (ring buffer overwrite, no shifting)
+        state.history[state.data_count % 50] = state.values
         state.data_count += 1
         
         # Broadcast
         await broadcast_state()
 
-def update_sensor(id: str, value: float, unit: str, high_thresh: float, low_thresh: float):
-    status = "normal"
-    if value > high_thresh or value < low_thresh:
-        status = "warning"
-        if value > high_thresh * 1.05 or value < low_thresh * 0.95:
-             status = "critical"
-    
-    state.sensors[id] = SensorData(id=id, value=round(value, 2), unit=unit, status=status)
+def update_sensors():
+    vals = state.values
+    status_codes = np.where(
+        (vals > THRESH_HI * 1.05) | (vals < THRESH_LO * 0.95), 2,
+        np.where((vals > THRESH_HI) | (vals < THRESH_LO), 1, 0),
+    )
+    rounded = np.round(vals, 2)
+    # Plain dicts: these are self-generated values, nothing needs validating,
+    # and the broadcast path serializes dicts directly
+    state.sensors = {
+        sensor_id: {"id": sensor_id, "value": float(value), "unit": unit, "status": STATUS[code]}
+        for sensor_id, value, unit, code in zip(SENSOR_IDS, rounded, SENSOR_UNITS, status_codes)
+    }
 
 async def ai_loop():
-    # Setup model
-    state.model = IsolationForest(n_estimators=100, contamination=0.05)
-    
+    # Setup model. The window only ever holds 50 samples, so 25 trees at
+    # max_samples=50 isolate as well as the 100-tree default at a quarter
+    # of the build cost.
+    state.model = IsolationForest(
+        n_estimators=25,
+        max_samples=50,
+        contamination=0.05,
+        n_jobs=-1,
+        bootstrap=False,
+    )
+
     while True:
-        await asyncio.sleep(10)
-        
+        await asyncio.sleep(1)
+
         # Warmup check
         if state.data_count < 50:
             # print(f"AI Warming up... {state.data_count}/50 samples")
             continue
 
-        # Prepare data for all sensors (simple flattening or feature extraction)
-        # Here we take the latest values of all sensors as a single sample point? 
-        # Or fit on the history of one sensor? 
-        # The prompt says "fit IsolationForest on window". Usually this means fit on the history of 50 samples.
-        # But we need to detect anomaly *now*. 
-        # Let's fit on the rolling window of combined features.
-        
-        data_matrix = []
-        # We need a matrix of shape (n_samples, n_features)
-        # Let's use the last 50 time steps as samples.
-        # Features: temp, pressure, ph, flow, vibration
-        
-        n_samples = len(state.history["temperature"])
-        if n_samples < 50:
-            continue
+        # The ring buffer already is the (50 samples, 5 features) window.
+        # Row order does not matter to IsolationForest, so no reordering needed.
+        # The window only shifts one row per tick, so refit every 10th tick
+        # and reuse the fitted trees for scoring in between.
+        if not state.is_model_fitted or state.data_count % 10 == 0:
+            state.model.fit(state.history)
+            # Pack the trees into flat arrays for the JIT-compiled scorer
+            state.packed_forest = iforest_scorer.pack_trees(state.model)
+            state.is_model_fitted = True
+
+        # Score the latest row with the compiled traversal instead of
+        # walking 25 Python-object trees through decision_function
+        latest = state.history[(state.data_count - 1) % 50]
+        score = iforest_scorer.decision_function(state.packed_forest, latest)
+        prediction = -1 if score < 0 else 1 # -1 for anomaly
 
-        for i in range(n_samples):
-            row = [
-                state.history["temperature"][i],
-                state.history["pressure"][i],
-                state.history["ph"][i],
-                state.history["flowRate"][i],
-                state.history["vibration"][i]
-            ]
-            data_matrix.append(row)
-        
-        X = np.array(data_matrix)
-        
-        # Fit model
-        state.model.fit(X)
-        state.is_model_fitted = True
-        
-        # Predict on latest
-        latest = X[-1].reshape(1, -1)
-        score = state.model.decision_function(latest)[0]
-        prediction = state.model.predict(latest)[0] # -1 for anomaly
-        
         # print(f"AI Score: {score:.3f}, Prediction: {prediction}")
 
         if score < -0.2:
@@ -192,35 +173,97 @@ async def ai_loop():
             state.twin_state["core"] = "critical"
             # Add anomaly event
             event = AnomalyEvent(zone="core", severity=abs(score), timestamp=state.data_count) # simplified timestamp
-            state.anomalies.append(event)
-            # Keep last 10
-            if len(state.anomalies) > 10:
-                state.anomalies.pop(0)
+            state.anomalies.append(event)  # maxlen evicts the oldest
         else:
             state.twin_state["core"] = "normal"
 
+async def _client_writer(websocket: WebSocket, queue: asyncio.Queue):
+    """Drain one client's queue, merging backed-up ticks into a single frame."""
+    try:
+        while True:
+            payload = await queue.get()
+            batch = [payload]
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            if len(batch) == 1:
+                await websocket.send_bytes(payload)
+            else:
+                # Client fell behind: ship all pending ticks as one frame
+                await websocket.send_bytes(b'{"type":"batch","ticks":[' + b",".join(batch) + b"]}")
+    except:
+        state.client_queues.pop(websocket, None)
+
 async def broadcast_state():
-    if not state.clients:
+    # The simulator process has no websocket clients of its own — it exists
+    # to publish ticks for the gunicorn workers — so only skip the tick when
+    # there is neither a local client nor a Redis channel to feed.
+    if not state.client_queues and state.redis is None:
         return
-    
+
     message = {
         "type": "sensor_update",
-        "payload": [s.dict() for s in state.sensors.values()],
+        "payload": list(state.sensors.values()),
         "twin_state": state.twin_state,
-        "anomalies": [a.dict() for a in state.anomalies[-1:]] if state.anomalies else [] # Send latest anomaly if exists? Or full list?
-        # Prompt says "push incremental updates... and anomaly events immediately". 
+        "anomalies": [state.anomalies[-1]] if state.anomalies else [] # Send latest anomaly if exists? Or full list?
+        # Prompt says "push incremental updates... and anomaly events immediately".
         # Let's send full sensor array.
     }
-    
-    disconnected = []
-    for client in state.clients:
+
+    # Serialize once with orjson (C, returns bytes directly). Each client's
+    # writer task drains its own queue, so slow sockets only drop their own
+    # ticks instead of stalling the broadcaster or other clients.
+    payload = orjson.dumps(message)
+    if state.redis is not None:
+        await state.redis.publish("sensors", payload)
+    _enqueue_payload(payload)
+
+def _init_payload() -> bytes:
+    # Re-serialize the "init" snapshot at most once per tick; connection
+    # storms within a tick all get the same cached bytes
+    if state.init_cache is None or state.init_cache_version != state.data_count:
+        state.init_cache = orjson.dumps({
+            "type": "init",
+            "payload": list(state.sensors.values()),
+            "twin_state": state.twin_state,
+            "anomalies": list(state.anomalies),
+        })
+        state.init_cache_version = state.data_count
+    return state.init_cache
+
+def _enqueue_payload(payload: bytes):
+    for queue in state.client_queues.values():
         try:
-            await client.send_text(json.dumps(message))
-        except:
-            disconnected.append(client)
-    
-    for client in disconnected:
-        state.clients.remove(client)
+            queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            queue.get_nowait()  # drop the oldest tick
+            queue.put_nowait(payload)
+
+async def redis_subscriber(redis_url: str):
+    """Mirror the simulator process's broadcasts into this worker.
+
+    Under gunicorn each worker runs this instead of the simulation itself;
+    the latest snapshot is kept locally so /chat keeps working.
+    """
+    import redis.asyncio as aioredis
+
+    client = aioredis.from_url(redis_url)
+    pubsub = client.pubsub()
+    await pubsub.subscribe("sensors")
+    async for message in pubsub.listen():
+        if message["type"] != "message":
+            continue
+        payload = message["data"]
+        parsed = orjson.loads(payload)
+        state.sensors = {s["id"]: s for s in parsed["payload"]}
+        state.twin_state = parsed["twin_state"]
+        # Each broadcast repeats the latest anomaly, so only append new ones
+        for anomaly in parsed["anomalies"]:
+            if not state.anomalies or state.anomalies[-1] != anomaly:
+                state.anomalies.append(anomaly)
+        # Advance the tick counter the simulator normally drives so the
+        # per-tick init-snapshot cache keys correctly in worker mode too
+        state.data_count += 1
+        _enqueue_payload(payload)
 
 # --- Endpoints ---
 
@@ -232,57 +275,68 @@ async def startup_event():
     # Initialize only HF Client, bypassing full RAG Pipeline
     state.hf_client = HFInferenceClient(state.settings)
     
-    asyncio.create_task(simulate_sensors())
-    asyncio.create_task(ai_loop())
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        # Multi-worker deployment: simulator.py owns the simulation and
+        # publishes over Redis; this worker only subscribes and fans out.
+        asyncio.create_task(redis_subscriber(redis_url))
+    else:
+        asyncio.create_task(simulate_sensors())
+        asyncio.create_task(ai_loop())
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
-    state.clients.append(websocket)
-    
-    # Send initial state
-    init_msg = {
-        "type": "init",
-        "payload": [s.dict() for s in state.sensors.values()],
-        "twin_state": state.twin_state,
-        "anomalies": [a.dict() for a in state.anomalies]
-    }
-    await websocket.send_text(json.dumps(init_msg))
-    
+    queue: asyncio.Queue = asyncio.Queue(maxsize=8)
+    state.client_queues[websocket] = queue
+    writer = asyncio.create_task(_client_writer(websocket, queue))
+
+    # Send initial state (snapshot bytes shared across accepts in one tick)
+    await websocket.send_bytes(_init_payload())
+
+
     try:
         while True:
             await websocket.receive_text() # Keep connection open
     except WebSocketDisconnect:
-        state.clients.remove(websocket)
+        state.client_queues.pop(websocket, None)
+        writer.cancel()
+
+# Includes common inflections: tokens are matched exactly, so "anomalies"
+# must be listed alongside "anomaly"
+CHAT_KEYWORDS = frozenset({"status", "how", "temperature", "temperatures", "pressure", "pressures", "anomaly", "anomalies", "wrong"})
+_WORD_RE = re.compile(r"\w+")
+_DEFAULT_TEMP = {"value": 0, "unit": "C", "status": "unknown"}
+_DEFAULT_PRESSURE = {"value": 0, "unit": "MPa", "status": "unknown"}
 
 @app.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
-    # Rule based logic
-    question = request.question.lower()
-    
+    # Rule based logic: one tokenize pass instead of a substring scan per keyword
+    hits = set(_WORD_RE.findall(request.question.lower())) & CHAT_KEYWORDS
+
     status = state.twin_state["core"]
-    temp = state.sensors.get("temperature", SensorData(id="temp", value=0, unit="C", status="unknown"))
-    pressure = state.sensors.get("pressure", SensorData(id="pressure", value=0, unit="MPa", status="unknown"))
-    
+    temp = state.sensors.get("temperature", _DEFAULT_TEMP)
+    pressure = state.sensors.get("pressure", _DEFAULT_PRESSURE)
+
     answer = ""
-    if "status" in question or "how" in question:
+    if "status" in hits or "how" in hits:
         answer = f"The reactor core status is currently {status}. "
-    
-    if "temperature" in question:
-        answer += f"Temperature is {temp.value}{temp.unit}. "
-        
-    if "pressure" in question:
-        answer += f"Pressure is {pressure.value}{pressure.unit}. "
-        
-    if "anomaly" in question or "wrong" in question:
+
+    if "temperature" in hits or "temperatures" in hits:
+        answer += f"Temperature is {temp['value']}{temp['unit']}. "
+
+    if "pressure" in hits or "pressures" in hits:
+        answer += f"Pressure is {pressure['value']}{pressure['unit']}. "
+
+    if "anomaly" in hits or "anomalies" in hits or "wrong" in hits:
         if status == "critical":
             answer += "WARNING: Anomaly detected in the core zone! Check alerts."
         else:
             answer += "No active anomalies detected."
-            
+
     if not answer:
-        answer = f"System is running. Core status: {status}. Temp: {temp.value}. Pressure: {pressure.value}."
-        
+        answer = f"System is running. Core status: {status}. Temp: {temp['value']}. Pressure: {pressure['value']}."
+
     return ChatResponse(answer=answer)
 
 @app.post("/rag/chat", response_model=RAGChatResponse)
@@ -303,4 +357,4 @@ async def rag_chat(request: ChatRequest):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools", ws="websockets")
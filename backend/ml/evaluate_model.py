@@ -57,9 +57,7 @@ def load_data():
 def load_model():
     try:
         import joblib
-        model  = joblib.load(MODEL_DIR / "anomaly_detector.joblib")
-        scaler = joblib.load(MODEL_DIR / "scaler.joblib")
-        return model, scaler
+        return joblib.load(MODEL_DIR / "anomaly_detector.joblib")
     except FileNotFoundError:
         print("[ERROR] Model not found. Run train_anomaly_model.py first.")
         sys.exit(1)
@@ -67,27 +65,25 @@ def load_model():
 
 # ─── Predictions ─────────────────────────────────────────────────────────────
 
-def get_predictions(model, scaler, df):
-    X = df[FEATURE_COLS].values
-    X_scaled = scaler.transform(X)
-    
-    # Predictions: 1 = inlier, -1 = outlier
-    preds_raw = model.predict(X_scaled)
-    preds = (preds_raw == -1).astype(int)  # 1 = anomaly, 0 = normal
-    
-    # Anomaly scores (lower = more anomalous)
-    scores = model.decision_function(X_scaled)
-    
+def get_predictions(model, df):
+    # float32 is what the trees score in; converting once here avoids a
+    # float64 copy inside sklearn's input validation
+    X = np.ascontiguousarray(df[FEATURE_COLS].to_numpy(dtype=np.float32))
+
+    # Single scoring pass over the matrix: predict() internally recomputes
+    # the same scores, so derive the labels from the decision function.
+    # (This is also the seam for a cuML/treelite FIL predictor on GPU hosts.)
+    scores = model.decision_function(X)  # lower = more anomalous
+    preds = (scores < 0).astype(int)  # 1 = anomaly, 0 = normal
+
     y_true = df["anomaly"].astype(int).values
-    
+
     return y_true, preds, scores
 
 
 # ─── 1. Confusion Matrix ─────────────────────────────────────────────────────
 
-def plot_confusion_matrix(y_true, y_pred, save_path):
-    cm = confusion_matrix(y_true, y_pred)
-    
+def plot_confusion_matrix(cm, save_path):
     fig, ax = plt.subplots(figsize=(8, 6))
     sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', cbar=False,
                 xticklabels=['Normal', 'Anomaly'],
@@ -116,20 +112,15 @@ def plot_confusion_matrix(y_true, y_pred, save_path):
 
 # ─── 2. Feature Distributions ────────────────────────────────────────────────
 
-def plot_feature_distributions(df, y_true, save_path):
+def plot_feature_distributions(X, normal_mask, anomaly_mask, save_path):
     fig, axes = plt.subplots(2, 2, figsize=(14, 10))
     axes = axes.ravel()
-    
+
     for i, feature in enumerate(FEATURE_COLS):
         ax = axes[i]
-        
-        # Normal samples
-        normal_data = df.loc[y_true == 0, feature]
-        # Anomaly samples
-        anomaly_data = df.loc[y_true == 1, feature]
-        
-        ax.hist(normal_data, bins=40, alpha=0.6, label='Normal', color='steelblue', edgecolor='black')
-        ax.hist(anomaly_data, bins=40, alpha=0.7, label='Anomaly', color='crimson', edgecolor='black')
+
+        ax.hist(X[normal_mask, i], bins=40, alpha=0.6, label='Normal', color='steelblue', edgecolor='black')
+        ax.hist(X[anomaly_mask, i], bins=40, alpha=0.7, label='Anomaly', color='crimson', edgecolor='black')
         
         ax.set_xlabel(feature.replace('_', ' ').title(), fontsize=11, fontweight='bold')
         ax.set_ylabel('Frequency', fontsize=11, fontweight='bold')
@@ -145,12 +136,12 @@ def plot_feature_distributions(df, y_true, save_path):
 
 # ─── 3. Anomaly Scores Distribution ──────────────────────────────────────────
 
-def plot_anomaly_scores(y_true, scores, save_path):
+def plot_anomaly_scores(scores, normal_mask, anomaly_mask, save_path):
     fig, ax = plt.subplots(figsize=(10, 6))
-    
-    normal_scores = scores[y_true == 0]
-    anomaly_scores = scores[y_true == 1]
-    
+
+    normal_scores = scores[normal_mask]
+    anomaly_scores = scores[anomaly_mask]
+
     ax.hist(normal_scores, bins=50, alpha=0.6, label='Normal', color='steelblue', edgecolor='black')
     ax.hist(anomaly_scores, bins=50, alpha=0.7, label='Anomaly', color='crimson', edgecolor='black')
     
@@ -169,9 +160,9 @@ def plot_anomaly_scores(y_true, scores, save_path):
 
 # ─── 4. ROC Curve ────────────────────────────────────────────────────────────
 
-def plot_roc_curve(y_true, scores, save_path):
-    # Use negative scores for ROC (higher score = more likely anomaly)
-    fpr, tpr, _ = roc_curve(y_true, -scores)
+def plot_roc_curve(y_true, neg_scores, save_path):
+    # Negated scores: higher = more likely anomaly
+    fpr, tpr, _ = roc_curve(y_true, neg_scores)
     roc_auc = auc(fpr, tpr)
     
     fig, ax = plt.subplots(figsize=(8, 8))
@@ -194,8 +185,8 @@ def plot_roc_curve(y_true, scores, save_path):
 
 # ─── 5. Precision-Recall Curve ──────────────────────────────────────────────
 
-def plot_precision_recall(y_true, scores, save_path):
-    precision, recall, _ = precision_recall_curve(y_true, -scores)
+def plot_precision_recall(y_true, neg_scores, save_path):
+    precision, recall, _ = precision_recall_curve(y_true, neg_scores)
     pr_auc = auc(recall, precision)
     
     fig, ax = plt.subplots(figsize=(8, 8))
@@ -217,9 +208,10 @@ def plot_precision_recall(y_true, scores, save_path):
 
 # ─── 6. Summary Metrics ──────────────────────────────────────────────────────
 
-def save_metrics(y_true, y_pred, scores, roc_auc, pr_auc, save_path):
+def save_metrics(y_true, y_pred, scores, roc_auc, pr_auc, cm, save_path):
     from sklearn.metrics import accuracy_score, precision_score, recall_score
-    
+
+    tn, fp, fn, tp = cm.ravel()
     metrics = {
         "accuracy": float(accuracy_score(y_true, y_pred)),
         "precision": float(precision_score(y_true, y_pred)),
@@ -228,10 +220,10 @@ def save_metrics(y_true, y_pred, scores, roc_auc, pr_auc, save_path):
         "roc_auc": float(roc_auc),
         "pr_auc": float(pr_auc),
         "confusion_matrix": {
-            "tn": int(confusion_matrix(y_true, y_pred)[0, 0]),
-            "fp": int(confusion_matrix(y_true, y_pred)[0, 1]),
-            "fn": int(confusion_matrix(y_true, y_pred)[1, 0]),
-            "tp": int(confusion_matrix(y_true, y_pred)[1, 1])
+            "tn": int(tn),
+            "fp": int(fp),
+            "fn": int(fn),
+            "tp": int(tp)
         }
     }
     
@@ -252,24 +244,33 @@ def main():
     print("=" * 60)
     
     df = load_data()
-    model, scaler = load_model()
-    
-    y_true, y_pred, scores = get_predictions(model, scaler, df)
-    
+    model = load_model()
+
+    y_true, y_pred, scores = get_predictions(model, df)
+
+    # Shared across the plots below: scan the arrays once, not per figure
+    normal_mask = y_true == 0
+    anomaly_mask = ~normal_mask
+    neg_scores = -scores
+    X = df[FEATURE_COLS].to_numpy(dtype=np.float32)
+
     print(f"\nDataset: {len(df)} samples")
-    print(f"  Normal:   {sum(y_true == 0)} ({sum(y_true == 0)/len(df)*100:.1f}%)")
-    print(f"  Anomaly:  {sum(y_true == 1)} ({sum(y_true == 1)/len(df)*100:.1f}%)")
+    print(f"  Normal:   {normal_mask.sum()} ({normal_mask.sum()/len(df)*100:.1f}%)")
+    print(f"  Anomaly:  {anomaly_mask.sum()} ({anomaly_mask.sum()/len(df)*100:.1f}%)")
     print()
-    
+
+    # Confusion matrix is shared by the plot and the metrics JSON
+    cm = confusion_matrix(y_true, y_pred)
+
     # Generate plots
-    plot_confusion_matrix(y_true, y_pred, REPORT_DIR / "confusion_matrix.png")
-    plot_feature_distributions(df, y_true, REPORT_DIR / "feature_distributions.png")
-    plot_anomaly_scores(y_true, scores, REPORT_DIR / "anomaly_scores.png")
-    roc_auc = plot_roc_curve(y_true, scores, REPORT_DIR / "roc_curve.png")
-    pr_auc = plot_precision_recall(y_true, scores, REPORT_DIR / "precision_recall_curve.png")
+    plot_confusion_matrix(cm, REPORT_DIR / "confusion_matrix.png")
+    plot_feature_distributions(X, normal_mask, anomaly_mask, REPORT_DIR / "feature_distributions.png")
+    plot_anomaly_scores(scores, normal_mask, anomaly_mask, REPORT_DIR / "anomaly_scores.png")
+    roc_auc = plot_roc_curve(y_true, neg_scores, REPORT_DIR / "roc_curve.png")
+    pr_auc = plot_precision_recall(y_true, neg_scores, REPORT_DIR / "precision_recall_curve.png")
     
     # Save metrics
-    metrics = save_metrics(y_true, y_pred, scores, roc_auc, pr_auc, REPORT_DIR / "metrics.json")
+    metrics = save_metrics(y_true, y_pred, scores, roc_auc, pr_auc, cm, REPORT_DIR / "metrics.json")
     
     print("\n" + "=" * 60)
     print("  SUMMARY METRICS")
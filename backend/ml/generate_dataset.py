@@ -14,9 +14,9 @@ Outputs:
 """
 
 import os
-import json
-import random
-import csv
+import orjson
+import numpy as np
+import pandas as pd
 from pathlib import Path
 
 # ─── Configuration ───────────────────────────────────────────────────────────
@@ -30,88 +30,83 @@ TEMP_MEAN, TEMP_STD         = 25.0, 2.0      # °C
 PRESSURE_BASE               = 5.0            # bar
 PH_BASE                     = 7.0
 
-random.seed(42)
-
-# ─── Helpers ─────────────────────────────────────────────────────────────────
-
-def normal_sample() -> dict:
-    flow = round(random.gauss(FLOW_MEAN, FLOW_STD), 2)
-    temp = round(random.gauss(TEMP_MEAN, TEMP_STD), 2)
-    noise_p = round(random.uniform(-0.25, 0.25), 3)
-    pressure = round(PRESSURE_BASE + flow * 0.8 + (temp - 25) * 0.02 + noise_p, 2)
-    noise_ph = round(random.uniform(-0.1, 0.1), 3)
-    ph = round(PH_BASE + (flow - 5) * 0.05 + (temp - 25) * 0.02 + noise_ph, 2)
-    ph = max(0.0, min(14.0, ph))
-    return {
-        "flow_l_min": flow,
-        "temperature_c": temp,
-        "pressure_bar": pressure,
-        "ph": ph,
-        "anomaly": False,
-    }
-
-
-def anomaly_sample() -> dict:
-    sample = normal_sample()
-    anomaly_type = random.choice(["flow", "temperature", "pressure", "ph"])
-
-    if anomaly_type == "flow":
-        # Spike > 2× normal
-        sample["flow_l_min"] = round(random.uniform(10.5, 20.0), 2)
-    elif anomaly_type == "temperature":
-        # Shift ± 10 °C
-        if random.random() < 0.5:
-            sample["temperature_c"] = round(random.uniform(0.0, 14.9), 2)
-        else:
-            sample["temperature_c"] = round(random.uniform(35.1, 50.0), 2)
-    elif anomaly_type == "pressure":
-        # Spike ± 5 bar
-        if random.random() < 0.5:
-            sample["pressure_bar"] = round(random.uniform(-5.0, -0.1), 2)
-        else:
-            sample["pressure_bar"] = round(random.uniform(10.1, 15.0), 2)
-    elif anomaly_type == "ph":
-        # Outlier < 6 or > 9
-        if random.random() < 0.5:
-            sample["ph"] = round(random.uniform(0.0, 5.9), 2)
-        else:
-            sample["ph"] = round(random.uniform(9.1, 14.0), 2)
-
-    sample["anomaly"] = True
-    return sample
-
+rng = np.random.default_rng(42)
 
 # ─── Main ────────────────────────────────────────────────────────────────────
 
 def generate_dataset(num_samples: int = NUM_SAMPLES) -> list[dict]:
     num_anomalies = int(num_samples * ANOMALY_RATIO)
-    num_normal    = num_samples - num_anomalies
-
-    data = [normal_sample() for _ in range(num_normal)]
-    data += [anomaly_sample() for _ in range(num_anomalies)]
-    random.shuffle(data)
-
-    # Add sequential timestamp
-    for i, row in enumerate(data):
-        row["timestamp"] = i * 1000  # ms, 1-second intervals
 
-    return data
+    # Normal baselines for every sample: one vectorized draw per column
+    # instead of per-sample random.gauss/random.uniform calls
+    flow = rng.normal(FLOW_MEAN, FLOW_STD, num_samples).round(2)
+    temp = rng.normal(TEMP_MEAN, TEMP_STD, num_samples).round(2)
+    noise_p = rng.uniform(-0.25, 0.25, num_samples).round(3)
+    pressure = np.round(PRESSURE_BASE + flow * 0.8 + (temp - 25) * 0.02 + noise_p, 2)
+    noise_ph = rng.uniform(-0.1, 0.1, num_samples).round(3)
+    ph = np.clip(np.round(PH_BASE + (flow - 5) * 0.05 + (temp - 25) * 0.02 + noise_ph, 2), 0.0, 14.0)
+
+    anomaly = np.zeros(num_samples, dtype=bool)
+    anomaly[:num_anomalies] = True
+
+    # Anomaly overrides applied via boolean masks on the first num_anomalies
+    # rows (the final permutation shuffles them through the dataset)
+    anomaly_type = rng.integers(0, 4, num_anomalies)
+    coin = rng.random(num_anomalies) < 0.5
+
+    # Flow spike > 2× normal
+    mask = anomaly_type == 0
+    flow[:num_anomalies][mask] = rng.uniform(10.5, 20.0, mask.sum()).round(2)
+    # Temperature shift ± 10 °C
+    mask = anomaly_type == 1
+    temp[:num_anomalies][mask] = np.where(
+        coin[mask],
+        rng.uniform(0.0, 14.9, mask.sum()),
+        rng.uniform(35.1, 50.0, mask.sum()),
+    ).round(2)
+    # Pressure spike ± 5 bar
+    mask = anomaly_type == 2
+    pressure[:num_anomalies][mask] = np.where(
+        coin[mask],
+        rng.uniform(-5.0, -0.1, mask.sum()),
+        rng.uniform(10.1, 15.0, mask.sum()),
+    ).round(2)
+    # pH outlier < 6 or > 9
+    mask = anomaly_type == 3
+    ph[:num_anomalies][mask] = np.where(
+        coin[mask],
+        rng.uniform(0.0, 5.9, mask.sum()),
+        rng.uniform(9.1, 14.0, mask.sum()),
+    ).round(2)
+
+    order = rng.permutation(num_samples)
+    return [
+        {
+            "flow_l_min": f,
+            "temperature_c": t,
+            "pressure_bar": p,
+            "ph": h,
+            "anomaly": a,
+            "timestamp": i * 1000,  # ms, 1-second intervals
+        }
+        for i, (f, t, p, h, a) in enumerate(
+            zip(flow[order].tolist(), temp[order].tolist(),
+                pressure[order].tolist(), ph[order].tolist(), anomaly[order].tolist())
+        )
+    ]
 
 
 def save_csv(data: list[dict], path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     fields = ["timestamp", "flow_l_min", "temperature_c", "pressure_bar", "ph", "anomaly"]
-    with open(path, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fields)
-        writer.writeheader()
-        writer.writerows(data)
+    # pandas' C writer streams rows instead of dict-lookup + repr per field
+    pd.DataFrame(data, columns=fields).to_csv(path, index=False)
     print(f"[CSV]  Saved {len(data)} samples → {path}")
 
 
 def save_json(data: list[dict], path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
+    path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
     print(f"[JSON] Saved {len(data)} samples → {path}")
 
 
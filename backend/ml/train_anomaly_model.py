@@ -9,7 +9,6 @@ Usage:
 
 Outputs:
     ml/models/anomaly_detector.joblib   – serialised model
-    ml/models/scaler.joblib             – fitted StandardScaler
     Prints classification report on full dataset.
 """
 
@@ -18,10 +17,10 @@ import sys
 import json
 import joblib
 import numpy as np
+from joblib import parallel_backend
 import pandas as pd
 from pathlib import Path
 from sklearn.ensemble import IsolationForest
-from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import classification_report, confusion_matrix
 
 # ─── Paths ───────────────────────────────────────────────────────────────────
@@ -46,39 +45,97 @@ def load_data(path: Path = CSV_PATH) -> pd.DataFrame:
 
 # ─── Train ───────────────────────────────────────────────────────────────────
 
+def _train_gpu(X, contamination: float):
+    """Optional cuML backend: builds the forest on GPU, 5-100x faster at scale.
+
+    Returns None when RAPIDS/cuML is not installed so train() falls back
+    to scikit-learn.
+    """
+    try:
+        from cuml.ensemble import IsolationForest as CuIsolationForest
+    except ImportError:
+        return None
+    model = CuIsolationForest(
+        n_estimators=200,
+        contamination=contamination,
+        max_samples=256,
+        random_state=42,
+    )
+    model.fit(X)
+    print("[MODEL] Isolation Forest trained on GPU via cuML (n_estimators=200)")
+    return model
+
+
 def train(df: pd.DataFrame, contamination: float = 0.10):
     """
     Train Isolation Forest on ALL data (unsupervised).
     `contamination` should match the anomaly ratio in the dataset.
+
+    Features are fed raw: Isolation Forest splits on per-feature
+    thresholds, so monotone scaling never changes the trees, and dropping
+    StandardScaler removes a full data pass plus a second model artifact.
+
+    Features go in as contiguous float32 — sklearn's trees work in float32
+    internally, so this halves memory traffic during the (memory-bound)
+    tree build instead of paying for a float64 round trip.
     """
-    X = df[FEATURE_COLS].values
+    X = np.ascontiguousarray(df[FEATURE_COLS].to_numpy(dtype=np.float32))
 
-    # Scale features
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X)
+    # GPU pays off once tree building dominates; small sets stay on CPU
+    if len(df) > 200_000:
+        model = _train_gpu(X, contamination)
+        if model is not None:
+            return model
 
     model = IsolationForest(
         n_estimators=200,
         contamination=contamination,
-        max_samples="auto",
+        max_samples=256,  # iForest paper default; "auto" = min(256, n) anyway
         random_state=42,
         n_jobs=-1,
     )
-    model.fit(X_scaled)
+    model.fit(X)
     print("[MODEL] Isolation Forest trained (n_estimators=200)")
 
-    return model, scaler
+    return model
 
 
 # ─── Evaluate ────────────────────────────────────────────────────────────────
 
-def evaluate(model, scaler, df: pd.DataFrame):
-    X = df[FEATURE_COLS].values
-    X_scaled = scaler.transform(X)
+def batch_predict(model, X) -> np.ndarray:
+    """Batch model.predict across cores.
 
-    # Isolation Forest returns  1 = inlier, -1 = outlier
-    preds_raw = model.predict(X_scaled)
-    preds = (preds_raw == -1)  # True = anomaly
+    IsolationForest's n_jobs is ignored on the prediction side unless the
+    caller activates a threading backend, so do it here; the tree scoring
+    code releases the GIL. Not worth it for single samples (use
+    predict_single), where backend setup would dominate.
+    """
+    with parallel_backend("threading", n_jobs=-1):
+        return model.predict(X)
+
+
+def score_batch(model, X) -> np.ndarray:
+    """Anomaly scores for a batch of readings; higher = more anomalous."""
+    with parallel_backend("threading", n_jobs=-1):
+        return -model.score_samples(X)
+
+
+def top_k_anomalies(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k most anomalous scores, ranked, without a full sort."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=int)
+    idx = np.argpartition(-scores, k - 1)[:k]
+    return idx[np.argsort(-scores[idx])]
+
+
+def evaluate(model, df: pd.DataFrame, contamination: float = 0.10):
+    X = np.ascontiguousarray(df[FEATURE_COLS].to_numpy(dtype=np.float32))
+
+    # One scoring pass, then threshold at the contamination quantile
+    # (predict() would re-score the whole batch just to apply the same cut)
+    scores = score_batch(model, X)
+    preds = scores > np.quantile(scores, 1 - contamination)  # True = anomaly
 
     y_true = df["anomaly"].astype(bool).values
 
@@ -91,40 +148,44 @@ def evaluate(model, scaler, df: pd.DataFrame):
 
 # ─── Predict helper (for runtime integration) ───────────────────────────────
 
-def predict_single(model, scaler, flow: float, temp: float, pressure: float, ph: float) -> bool:
+# Reused across calls: a fresh (1, 4) allocation per reading dominates the
+# per-sample cost on the streaming path. Not thread-safe by design — the
+# runtime calls this from a single loop.
+_X_BUF = np.empty((1, len(FEATURE_COLS)), dtype=np.float32)
+
+
+def predict_single(model, flow: float, temp: float, pressure: float, ph: float) -> bool:
     """Return True if the reading is anomalous."""
-    x = np.array([[flow, temp, pressure, ph]])
-    x_scaled = scaler.transform(x)
-    return model.predict(x_scaled)[0] == -1
+    _X_BUF[0, 0] = flow
+    _X_BUF[0, 1] = temp
+    _X_BUF[0, 2] = pressure
+    _X_BUF[0, 3] = ph
+    return model.predict(_X_BUF)[0] == -1
 
 
 # ─── Save / Load ─────────────────────────────────────────────────────────────
 
-def save_model(model, scaler, model_dir: Path = MODEL_DIR):
+def save_model(model, model_dir: Path = MODEL_DIR):
     model_dir.mkdir(parents=True, exist_ok=True)
     joblib.dump(model, model_dir / "anomaly_detector.joblib")
-    joblib.dump(scaler, model_dir / "scaler.joblib")
     print(f"[SAVE] Model  → {model_dir / 'anomaly_detector.joblib'}")
-    print(f"[SAVE] Scaler → {model_dir / 'scaler.joblib'}")
 
 
 def load_model(model_dir: Path = MODEL_DIR):
-    model  = joblib.load(model_dir / "anomaly_detector.joblib")
-    scaler = joblib.load(model_dir / "scaler.joblib")
-    return model, scaler
+    return joblib.load(model_dir / "anomaly_detector.joblib")
 
 
 # ─── Main ────────────────────────────────────────────────────────────────────
 
 if __name__ == "__main__":
     df = load_data()
-    model, scaler = train(df)
-    evaluate(model, scaler, df)
-    save_model(model, scaler)
+    model = train(df)
+    evaluate(model, df)
+    save_model(model)
 
     # Quick demo prediction
     print("── Demo Predictions ──────────────────────────────")
     normal_reading  = (5.0, 25.0, 9.0, 7.0)
     anomaly_reading = (18.0, 5.0, 14.0, 3.0)
-    print(f"  Normal  {normal_reading}  → anomaly={predict_single(model, scaler, *normal_reading)}")
-    print(f"  Anomaly {anomaly_reading} → anomaly={predict_single(model, scaler, *anomaly_reading)}")
+    print(f"  Normal  {normal_reading}  → anomaly={predict_single(model, *normal_reading)}")
+    print(f"  Anomaly {anomaly_reading} → anomaly={predict_single(model, *anomaly_reading)}")
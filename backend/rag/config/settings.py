@@ -1,21 +1,18 @@
+import functools
 import os
+import re
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
+# KEY=VALUE lines, skipping blanks and comments, in one multiline pass
+_ENV_RE = re.compile(r"^\s*([^#=\s][^=]*)=(.*)$", re.M)
+
 
 def load_env_file(path: Path) -> None:
     if not path.exists():
         return
-    for raw_line in path.read_text(encoding="utf-8").splitlines():
-        line = raw_line.strip()
-        if not line:
-            continue
-        if line.startswith("#"):
-            continue
-        if "=" not in line:
-            continue
-        key, value = line.split("=", 1)
+    for key, value in _ENV_RE.findall(path.read_text(encoding="utf-8")):
         os.environ.setdefault(key.strip(), value.strip())
 
 
@@ -33,7 +30,10 @@ class Settings:
     top_k: int
 
 
+@functools.lru_cache(maxsize=None)
 def get_settings(env_file: Optional[str] = None) -> Settings:
+    # Settings is frozen and the env file only setdefaults os.environ, so
+    # caching per env_file is safe and spares re-parsing on every fetch.
     if env_file:
         load_env_file(Path(env_file))
 
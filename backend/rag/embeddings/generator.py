@@ -1,5 +1,7 @@
 from typing import List
 
+import numpy as np
+
 from ..config import Settings
 
 
@@ -7,8 +9,8 @@ class EmbeddingGenerator:
     def __init__(self, settings: Settings) -> None:
         self.settings = settings
 
-    def embed(self, texts: List[str]) -> List[List[float]]:
-        if not texts:
-            return []
-        dim = self.settings.embedding_dim
-        return [[0.0 for _ in range(dim)] for _ in texts]
+    def embed(self, texts: List[str]) -> np.ndarray:
+        # One contiguous (n, dim) float32 buffer instead of nested Python
+        # lists of boxed floats; this is also the shape a real embedding
+        # model (SentenceTransformers/HF) returns.
+        return np.zeros((len(texts), self.settings.embedding_dim), dtype=np.float32)
@@ -1,7 +1,8 @@
 import json
-import urllib.error
-import urllib.request
-from typing import List
+from typing import Iterator, List, Optional
+
+import httpx
+import orjson
 
 from ..config import Settings
 
@@ -62,11 +63,52 @@ You are an industrial ammonia synthesis operations assistant.
 )
 
 
+# One connection pool shared by every client instance: keepalive + HTTP/2
+# multiplexing amortize the TLS handshake across calls
+_http_client: Optional[httpx.Client] = None
+
+
+def _get_http_client(timeout_s: int) -> httpx.Client:
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.Client(http2=True, timeout=timeout_s)
+    return _http_client
+
+
 class HFInferenceClient:
     def __init__(self, settings: Settings) -> None:
         self.settings = settings
+        self._headers = {
+            "Authorization": f"Bearer {settings.hf_api_token}",
+            "Content-Type": "application/json"
+        }
+        # The system context is multi-KB and static: JSON-escape it once
+        # here instead of re-serializing it on every generate() call
+        self._system_content_json = json.dumps(AMMONIA_REACTOR_CONTEXT)
+        self._model_json = json.dumps(settings.hf_model_id)
+        self._options_json = (
+            f'"max_tokens":{settings.hf_max_tokens},'
+            f'"temperature":{settings.hf_temperature},'
+            f'"top_p":{settings.hf_top_p}'
+        )
 
-    def generate(self, prompt: str, contexts: List[str]) -> str:
+    def _request_body(self, prompt: str, contexts: List[str], stream: bool = False) -> bytes:
+        if contexts:
+            context_block = "\n".join(contexts)
+            system_content_json = json.dumps(
+                f"{AMMONIA_REACTOR_CONTEXT}\n\nUse the following context to answer the question:\n{context_block}"
+            )
+        else:
+            system_content_json = self._system_content_json
+        return (
+            '{"model":' + self._model_json
+            + ',"messages":[{"role":"system","content":' + system_content_json
+            + '},{"role":"user","content":' + json.dumps(prompt)
+            + '}],' + self._options_json
+            + (',"stream":true}' if stream else ',"stream":false}')
+        ).encode("utf-8")
+
+    def _validate(self, prompt: str) -> None:
         if not self.settings.hf_api_token:
             raise ValueError("HF_API_TOKEN is required")
         if not self.settings.hf_model_id:
@@ -74,46 +116,64 @@ class HFInferenceClient:
         if not prompt:
             raise ValueError("Prompt is required")
 
-        messages: list[dict[str, str]] = []
-        if contexts:
-            context_block = "\n".join(contexts)
-            system_prompt = f"{AMMONIA_REACTOR_CONTEXT}\n\nUse the following context to answer the question:\n{context_block}"
-        else:
-            system_prompt = AMMONIA_REACTOR_CONTEXT
-        messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-
-        payload = {
-            "model": self.settings.hf_model_id,
-            "messages": messages,
-            "max_tokens": self.settings.hf_max_tokens,
-            "temperature": self.settings.hf_temperature,
-            "top_p": self.settings.hf_top_p,
-            "stream": False,
-        }
+    def stream(self, prompt: str, contexts: List[str]) -> Iterator[str]:
+        """Yield completion deltas as they arrive over SSE.
+
+        First-token latency drops to network + first-token time instead of
+        the full multi-second generation, and memory stays bounded to one
+        delta at a time.
+        """
+        self._validate(prompt)
         url = f"{self.settings.hf_api_base}/chat/completions"
-        request = urllib.request.Request(
-            url,
-            data=json.dumps(payload).encode("utf-8"),
-            headers={
-                "Authorization": f"Bearer {self.settings.hf_api_token}",
-                "Content-Type": "application/json"
-            },
-            method="POST"
-        )
+        client = _get_http_client(self.settings.hf_timeout_s)
         try:
-            with urllib.request.urlopen(request, timeout=self.settings.hf_timeout_s) as response:
-                raw = response.read().decode("utf-8")
-        except urllib.error.HTTPError as exc:
-            body = exc.read().decode("utf-8", errors="ignore")
-            detail = body or exc.reason
-            raise RuntimeError(f"Hugging Face request failed: HTTP {exc.code} {detail}") from exc
+            with client.stream(
+                "POST",
+                url,
+                content=self._request_body(prompt, contexts, stream=True),
+                headers=self._headers,
+            ) as response:
+                if response.status_code >= 400:
+                    # Read inside the stream context; after it closes the
+                    # body is gone and .text would raise
+                    detail = response.read().decode("utf-8", "replace") or response.reason_phrase
+                    raise RuntimeError(
+                        f"Hugging Face request failed: HTTP {response.status_code} {detail}"
+                    )
+                saw_sse = False
+                body_lines: List[str] = []
+                for line in response.iter_lines():
+                    if not line.startswith("data: "):
+                        # A 2xx response that isn't SSE (error dicts, legacy
+                        # generated_text bodies) arrives here; keep it so it
+                        # can be parsed below instead of vanishing
+                        if not saw_sse:
+                            body_lines.append(line)
+                        continue
+                    saw_sse = True
+                    data = line[6:]
+                    if data == "[DONE]":
+                        break
+                    try:
+                        delta = orjson.loads(data)["choices"][0]["delta"]
+                    except (orjson.JSONDecodeError, KeyError, IndexError, TypeError):
+                        continue
+                    content = delta.get("content")
+                    if content:
+                        yield content
+                if not saw_sse:
+                    yield self._non_stream_text("\n".join(body_lines))
+        except RuntimeError:
+            raise
         except Exception as exc:
             raise RuntimeError(f"Hugging Face request failed: {exc}") from exc
 
+    @staticmethod
+    def _non_stream_text(raw: str) -> str:
+        """Translate a non-SSE body the way the pre-streaming parser did."""
         try:
-            parsed = json.loads(raw)
-        except json.JSONDecodeError as exc:
+            parsed = orjson.loads(raw)
+        except orjson.JSONDecodeError as exc:
             raise RuntimeError("Invalid response from Hugging Face") from exc
 
         if isinstance(parsed, dict) and "error" in parsed:
@@ -133,3 +193,7 @@ class HFInferenceClient:
         if isinstance(parsed, dict) and "generated_text" in parsed:
             return str(parsed["generated_text"]).strip()
         return str(parsed)
+
+    def generate(self, prompt: str, contexts: List[str]) -> str:
+        """Blocking wrapper over stream() for callers that want the full text."""
+        return "".join(self.stream(prompt, contexts)).strip()
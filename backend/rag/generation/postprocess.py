@@ -1,23 +1,28 @@
+import re
+
+# Precompiled once; each pass runs in the regex engine instead of a
+# Python-level loop over lines
+_CRLF = re.compile(r"\r\n")
+_PREFIX = re.compile(r"^assistant:\s*", re.IGNORECASE)
+_QUOTED = re.compile(r"^(['\"])(.*)\1$", re.DOTALL)
+# \r included: str.strip()/rstrip() treated bare carriage returns as
+# whitespace, so \r-only lines must still collapse as blank
+_TRAILING_WS = re.compile(r"[ \t\r]+$", re.MULTILINE)
+_BLANKS = re.compile(r"\n{3,}")
+
+
 def postprocess_response(text: str) -> str:
-    cleaned = text.replace("\r\n", "\n").strip()
+    cleaned = _CRLF.sub("\n", text).strip()
     if not cleaned:
         return ""
-    lowered = cleaned.lower()
-    if lowered.startswith("assistant:"):
-        cleaned = cleaned.split(":", 1)[1].strip()
-    if (cleaned.startswith('"') and cleaned.endswith('"')) or (cleaned.startswith("'") and cleaned.endswith("'")):
-        inner = cleaned[1:-1].strip()
+    cleaned = _PREFIX.sub("", cleaned)
+    quoted = _QUOTED.match(cleaned)
+    if quoted:
+        inner = quoted.group(2).strip()
         if inner:
             cleaned = inner
-    lines = [line.rstrip() for line in cleaned.split("\n")]
-    collapsed: list[str] = []
-    blank_count = 0
-    for line in lines:
-        if not line.strip():
-            blank_count += 1
-            if blank_count <= 1:
-                collapsed.append("")
-            continue
-        blank_count = 0
-        collapsed.append(line)
-    return "\n".join(collapsed).strip()
+    # Strip per-line trailing whitespace first so whitespace-only lines
+    # become empty, then collapse runs of blank lines to a single one
+    cleaned = _TRAILING_WS.sub("", cleaned)
+    cleaned = _BLANKS.sub("\n\n", cleaned)
+    return cleaned.strip()
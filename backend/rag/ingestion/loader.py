@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List
 
@@ -7,10 +8,16 @@ class DocumentLoader:
         path = Path(directory)
         if not path.exists():
             raise FileNotFoundError(f"Document source not found: {directory}")
-        documents: List[Dict[str, str]] = []
-        for file_path in path.rglob("*"):
-            if not file_path.is_file():
-                continue
-            content = file_path.read_text(encoding="utf-8", errors="ignore")
-            documents.append({"id": str(file_path), "text": content})
-        return documents
+        files = [p for p in path.rglob("*") if p.is_file()]
+        if not files:
+            return []
+        # read_text releases the GIL during the read syscall, so threads give
+        # near-linear speedup on this I/O-bound walk; map preserves file order
+        with ThreadPoolExecutor(max_workers=min(32, len(files))) as executor:
+            contents = executor.map(
+                lambda p: p.read_text(encoding="utf-8", errors="ignore"), files
+            )
+            return [
+                {"id": str(file_path), "text": content}
+                for file_path, content in zip(files, contents)
+            ]
@@ -3,15 +3,19 @@ from typing import Dict, List
 
 class Preprocessor:
     def split(self, documents: List[Dict[str, str]], chunk_size: int = 500, overlap: int = 50) -> List[Dict[str, str]]:
+        # Chunk starts advance by chunk_size - overlap so consecutive chunks
+        # share `overlap` characters. (The old while loop stepped by the full
+        # chunk_size — `max(end - overlap, end)` is always `end` — so overlap
+        # silently never applied.)
+        step = max(1, chunk_size - overlap)
         chunks: List[Dict[str, str]] = []
         for doc in documents:
             text = doc.get("text", "")
             if not text:
                 continue
-            start = 0
-            while start < len(text):
-                end = min(len(text), start + chunk_size)
-                chunk_text = text[start:end]
-                chunks.append({"id": f"{doc.get('id', 'doc')}-{start}", "text": chunk_text})
-                start = max(end - overlap, end)
+            doc_id = doc.get("id", "doc")
+            chunks.extend(
+                {"id": f"{doc_id}-{start}", "text": text[start:start + chunk_size]}
+                for start in range(0, max(1, len(text) - overlap), step)
+            )
         return chunks
@@ -1,3 +1,3 @@
-from .metrics import MetricsTracker
+from .metrics import Metric, MetricsTracker
 
-__all__ = ["MetricsTracker"]
+__all__ = ["Metric", "MetricsTracker"]
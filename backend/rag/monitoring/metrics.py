@@ -1,16 +1,35 @@
 import time
+from enum import IntEnum
 from typing import Dict
 
+import numpy as np
+
+
+class Metric(IntEnum):
+    INGEST_SECONDS = 0
+    ANSWER_SECONDS = 1
+
 
 class MetricsTracker:
+    """Fixed-schema timings indexed by Metric.
+
+    perf_counter_ns is monotonic (wall-clock NTP jumps would corrupt
+    durations) and the flat int64 array makes record_duration a single
+    store — no dict resize or string hashing on the hot path.
+    """
+
     def __init__(self) -> None:
-        self._metrics: Dict[str, float] = {}
+        self._values = np.zeros(len(Metric), dtype=np.int64)
+
+    @staticmethod
+    def start() -> int:
+        return time.perf_counter_ns()
 
-    def record_duration(self, name: str, start_time: float) -> None:
-        self._metrics[name] = time.time() - start_time
+    def record_duration(self, metric: Metric, start_ns: int) -> None:
+        self._values[metric] = time.perf_counter_ns() - start_ns
 
-    def record_value(self, name: str, value: float) -> None:
-        self._metrics[name] = value
+    def record_value(self, metric: Metric, value_ns: int) -> None:
+        self._values[metric] = value_ns
 
     def snapshot(self) -> Dict[str, float]:
-        return dict(self._metrics)
+        return {m.name.lower(): float(self._values[m]) / 1e9 for m in Metric}
@@ -1,12 +1,13 @@
-import time
-from typing import Dict, List
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional
 
 from ..config import Settings
 from ..embeddings import EmbeddingGenerator
 from ..generation import HFInferenceClient, postprocess_response
 from ..ingestion import DocumentLoader, Preprocessor
 from ..logging import get_logger
-from ..monitoring import MetricsTracker
+from ..monitoring import Metric, MetricsTracker
 from ..retrieval import Retriever
 from ..vector_store import MemoryVectorStore, VectorIndex
 
@@ -24,8 +25,27 @@ class RAGPipeline:
         self.retriever = Retriever(settings, self.embedder, self.index)
         self.generator = HFInferenceClient(settings)
 
-    def ingest(self, directory: str) -> int:
-        start_time = time.time()
+    @staticmethod
+    def _corpus_digest(directory: str) -> str:
+        """Fingerprint the corpus by path, mtime, and size — no content reads."""
+        digest = hashlib.sha256()
+        for path in sorted(Path(directory).rglob("*")):
+            if path.is_file():
+                stat = path.stat()
+                digest.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size}\n".encode())
+        return digest.hexdigest()
+
+    def ingest(self, directory: str, cache_dir: Optional[str] = None) -> int:
+        start_ns = self.metrics.start()
+        if cache_dir:
+            cache = Path(cache_dir)
+            manifest = cache / "manifest.txt"
+            fingerprint = self._corpus_digest(directory)
+            if manifest.exists() and manifest.read_text() == fingerprint:
+                count = self.store.load(cache)
+                self.metrics.record_duration(Metric.INGEST_SECONDS, start_ns)
+                self.logger.info("Loaded %s cached chunks", count)
+                return count
         documents = self.loader.load_directory(directory)
         chunks = self.preprocessor.split(documents)
         if not chunks:
@@ -34,15 +54,18 @@ class RAGPipeline:
         ids = [chunk["id"] for chunk in chunks]
         payloads = [{"text": chunk["text"]} for chunk in chunks]
         self.index.add_documents(ids, vectors, payloads)
-        self.metrics.record_duration("ingest_seconds", start_time)
+        if cache_dir:
+            self.store.save(cache)
+            manifest.write_text(fingerprint)
+        self.metrics.record_duration(Metric.INGEST_SECONDS, start_ns)
         self.logger.info("Ingested %s chunks", len(ids))
         return len(ids)
 
     def answer(self, question: str) -> Dict[str, List[Dict[str, str]] | str]:
-        start_time = time.time()
+        start_ns = self.metrics.start()
         contexts = self.retriever.retrieve(question)
         context_texts = [item["text"] for item in contexts]
         response = self.generator.generate(question, context_texts)
         answer = postprocess_response(response)
-        self.metrics.record_duration("answer_seconds", start_time)
+        self.metrics.record_duration(Metric.ANSWER_SECONDS, start_ns)
         return {"answer": answer, "contexts": contexts}
@@ -13,7 +13,7 @@ class Retriever:
 
     def retrieve(self, query: str) -> List[Dict[str, str]]:
         vectors = self.embedder.embed([query])
-        if not vectors:
+        if len(vectors) == 0:
             return []
         results = self.index.search(vectors[0], self.settings.top_k)
         return [payload for _, _, payload in results]
@@ -10,6 +10,7 @@ def main() -> None:
     parser.add_argument("--env-file", default=None)
     parser.add_argument("--docs", required=True)
     parser.add_argument("--question", required=True)
+    parser.add_argument("--cache-dir", default=None, help="Reuse embeddings when the corpus is unchanged")
     args = parser.parse_args()
 
     settings = get_settings(args.env_file)
@@ -17,7 +18,7 @@ def main() -> None:
     logger = get_logger("rag.run")
 
     pipeline = RAGPipeline(settings)
-    pipeline.ingest(args.docs)
+    pipeline.ingest(args.docs, cache_dir=args.cache_dir)
     result = pipeline.answer(args.question)
     logger.info("Answer: %s", result["answer"])
 
@@ -0,0 +1,18 @@
+from rag.ingestion import Preprocessor
+
+
+def test_split_applies_overlap():
+    doc = {"id": "d", "text": "abcdefghij"}
+    chunks = Preprocessor().split([doc], chunk_size=4, overlap=2)
+
+    assert [c["text"] for c in chunks] == ["abcd", "cdef", "efgh", "ghij"]
+    assert [c["id"] for c in chunks] == ["d-0", "d-2", "d-4", "d-6"]
+
+
+def test_split_short_text_yields_single_chunk():
+    chunks = Preprocessor().split([{"id": "d", "text": "hi"}], chunk_size=500, overlap=50)
+    assert chunks == [{"id": "d-0", "text": "hi"}]
+
+
+def test_split_skips_empty_documents():
+    assert Preprocessor().split([{"id": "d", "text": ""}]) == []
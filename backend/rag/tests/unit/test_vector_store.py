@@ -0,0 +1,56 @@
+from rag.vector_store import MemoryVectorStore
+
+
+def test_query_ranks_by_cosine_similarity():
+    store = MemoryVectorStore()
+    store.add("a", [1.0, 0.0], {"text": "a"})
+    store.add("b", [0.0, 1.0], {"text": "b"})
+
+    results = store.query([1.0, 0.1], top_k=2)
+    assert [item_id for item_id, _, _ in results] == ["a", "b"]
+    assert results[0][1] > results[1][1]
+
+
+def test_add_many_matches_single_adds():
+    bulk = MemoryVectorStore()
+    bulk.add_many(["a", "b"], [[1.0, 0.0], [0.0, 1.0]], [{"text": "a"}, {"text": "b"}])
+
+    single = MemoryVectorStore()
+    single.add("a", [1.0, 0.0], {"text": "a"})
+    single.add("b", [0.0, 1.0], {"text": "b"})
+
+    assert bulk.query([1.0, 0.1], top_k=2) == single.query([1.0, 0.1], top_k=2)
+
+
+def test_quantized_store_preserves_ranking():
+    store = MemoryVectorStore(quantized=True)
+    store.add_many(
+        ["a", "b", "c"],
+        [[1.0, 0.0], [0.7, 0.7], [0.0, 1.0]],
+        [{"text": "a"}, {"text": "b"}, {"text": "c"}],
+    )
+
+    results = store.query([1.0, 0.1], top_k=3)
+    assert [item_id for item_id, _, _ in results] == ["a", "b", "c"]
+
+
+def test_add_after_load_keeps_loaded_vectors_queryable(tmp_path):
+    store = MemoryVectorStore()
+    store.add("a", [1.0, 0.0], {"text": "a"})
+    store.add("b", [0.0, 1.0], {"text": "b"})
+    store.add("c", [0.7, 0.7], {"text": "c"})
+    store.save(tmp_path)
+
+    loaded = MemoryVectorStore()
+    assert loaded.load(tmp_path) == 3
+    loaded.add("d", [-1.0, 0.0], {"text": "d"})
+
+    results = loaded.query([1.0, 0.1], top_k=4)
+    assert {item_id for item_id, _, _ in results} == {"a", "b", "c", "d"}
+    assert results[0][0] == "a"
+
+
+def test_query_caps_top_k_at_store_size():
+    store = MemoryVectorStore()
+    store.add("only", [0.5, 0.5], {"text": "only"})
+    assert len(store.query([1.0, 0.0], top_k=10)) == 1
@@ -1,30 +1,151 @@
-import math
+import pickle
+from pathlib import Path
 from typing import Dict, List, Tuple
 
+import numpy as np
+
+try:
+    import hnswlib
+except ImportError:  # optional ANN backend; queries fall back to the full scan
+    hnswlib = None
+
 
 class MemoryVectorStore:
-    def __init__(self) -> None:
-        self._vectors: Dict[str, List[float]] = {}
+    def __init__(self, quantized: bool = False) -> None:
+        self._ids: List[str] = []
         self._payloads: Dict[str, Dict[str, str]] = {}
+        # Rows are L2-normalized float32, so a query is one matmul plus a
+        # top-k partition; capacity doubles so add stays amortized O(1)
+        self._quantized = quantized
+        dtype = np.int8 if quantized else np.float32
+        self._matrix: np.ndarray = np.empty((0, 0), dtype=dtype)
+        # Per-row dequantization scale (int8 mode only): row = q * scale
+        self._scales: np.ndarray = np.empty(0, dtype=np.float32)
+        self._size: int = 0
+        # With hnswlib installed, queries go through an HNSW graph instead
+        # of the O(N*D) scan; inner product on normalized rows == cosine
+        self._index = None
+
+    def _ensure_capacity(self, needed: int, dim: int) -> None:
+        if self._matrix.shape[0] >= needed and self._matrix.shape[1] == dim:
+            return
+        capacity = max(64, needed, self._matrix.shape[0] * 2)
+        grown = np.zeros((capacity, dim), dtype=self._matrix.dtype)
+        if self._size:
+            grown[:self._size] = self._matrix[:self._size]
+        self._matrix = grown
+        if self._quantized:
+            grown_scales = np.zeros(capacity, dtype=np.float32)
+            grown_scales[:self._size] = self._scales[:self._size]
+            self._scales = grown_scales
+
+    @staticmethod
+    def _quantize(block: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Map each row to int8 with a per-row scale; 4x smaller than float32."""
+        scales = np.max(np.abs(block), axis=1) / 127.0
+        scales = np.maximum(scales, 1e-12)
+        q = np.round(block / scales[:, None]).astype(np.int8)
+        return q, scales.astype(np.float32)
 
     def add(self, item_id: str, vector: List[float], payload: Dict[str, str]) -> None:
-        self._vectors[item_id] = vector
+        row = np.asarray(vector, dtype=np.float32)
+        row = row / (np.linalg.norm(row) + 1e-12)
+        self._ensure_capacity(self._size + 1, row.shape[0])
+        if self._quantized:
+            q, scale = self._quantize(row.reshape(1, -1))
+            self._matrix[self._size] = q[0]
+            self._scales[self._size] = scale[0]
+        else:
+            self._matrix[self._size] = row
+        self._size += 1
+        self._ids.append(item_id)
         self._payloads[item_id] = payload
+        self._index_add(row.reshape(1, -1))
+
+    def add_many(self, ids: List[str], matrix, payloads: List[Dict[str, str]]) -> None:
+        """Bulk insert: one normalization pass and one matrix write for N rows."""
+        if not len(ids):
+            return
+        block = np.ascontiguousarray(matrix, dtype=np.float32)
+        norms = np.linalg.norm(block, axis=1, keepdims=True)
+        block = block / np.maximum(norms, 1e-12)
+        needed = self._size + block.shape[0]
+        self._ensure_capacity(needed, block.shape[1])
+        if self._quantized:
+            q, scales = self._quantize(block)
+            self._matrix[self._size:needed] = q
+            self._scales[self._size:needed] = scales
+        else:
+            self._matrix[self._size:needed] = block
+        self._size = needed
+        self._ids.extend(ids)
+        self._payloads.update(zip(ids, payloads))
+        self._index_add(block)
+
+    def _index_add(self, block: np.ndarray) -> None:
+        if hnswlib is None or self._quantized:
+            return
+        if self._index is None:
+            # Rows that predate the index (a load()ed store) would be
+            # invisible to a freshly built one, so stay on the scan path
+            if self._size > block.shape[0]:
+                return
+            self._index = hnswlib.Index(space="ip", dim=block.shape[1])
+            self._index.init_index(max_elements=max(1024, self._size), ef_construction=200, M=32)
+        if self._index.get_max_elements() < self._size:
+            self._index.resize_index(max(self._size, self._index.get_max_elements() * 2))
+        start = self._size - block.shape[0]
+        self._index.add_items(block, np.arange(start, self._size))
+
+    def save(self, directory: Path) -> None:
+        """Persist the store so a later process can load() instead of re-embedding."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        np.save(directory / "vectors.npy", self._matrix[:self._size])
+        with open(directory / "meta.pkl", "wb") as fh:
+            pickle.dump(
+                (self._ids, self._payloads, self._quantized, self._scales[:self._size]),
+                fh,
+            )
+
+    def load(self, directory: Path) -> int:
+        """Replace the store contents from a save() directory; returns row count.
+
+        The matrix is memory-mapped read-only, so startup is O(1) and pages
+        fault in on demand; a subsequent add() copies it into a writable
+        buffer via _ensure_capacity. The HNSW mirror is not rebuilt — loaded
+        stores query through the scan path.
+        """
+        directory = Path(directory)
+        with open(directory / "meta.pkl", "rb") as fh:
+            self._ids, self._payloads, self._quantized, self._scales = pickle.load(fh)
+        self._matrix = np.load(directory / "vectors.npy", mmap_mode="r")
+        self._size = self._matrix.shape[0]
+        self._index = None
+        return self._size
 
     def query(self, vector: List[float], top_k: int) -> List[Tuple[str, float, Dict[str, str]]]:
-        results: List[Tuple[str, float, Dict[str, str]]] = []
-        for item_id, stored_vector in self._vectors.items():
-            score = self._cosine_similarity(vector, stored_vector)
-            results.append((item_id, score, self._payloads[item_id]))
-        results.sort(key=lambda item: item[1], reverse=True)
-        return results[:top_k]
-
-    def _cosine_similarity(self, a: List[float], b: List[float]) -> float:
-        if not a or not b or len(a) != len(b):
-            return 0.0
-        dot = sum(x * y for x, y in zip(a, b))
-        norm_a = math.sqrt(sum(x * x for x in a))
-        norm_b = math.sqrt(sum(y * y for y in b))
-        if norm_a == 0 or norm_b == 0:
-            return 0.0
-        return dot / (norm_a * norm_b)
+        if self._size == 0 or top_k <= 0:
+            return []
+        q = np.asarray(vector, dtype=np.float32)
+        q = q / (np.linalg.norm(q) + 1e-12)
+        top_k = min(top_k, self._size)
+        if self._index is not None and self._index.get_current_count() == self._size:
+            # ~log(N) graph walk; hnswlib reports ip distance = 1 - dot
+            self._index.set_ef(max(64, top_k))
+            labels, distances = self._index.knn_query(q.reshape(1, -1), k=top_k)
+            return [
+                (self._ids[i], float(1.0 - d), self._payloads[self._ids[i]])
+                for i, d in zip(labels[0], distances[0])
+            ]
+        if self._quantized:
+            # int8 dot with int32 accumulation (int16 overflows past D~256),
+            # then undo both scales to recover the cosine score
+            q8, qscale = self._quantize(q.reshape(1, -1))
+            raw = self._matrix[:self._size].astype(np.int32) @ q8[0].astype(np.int32)
+            scores = raw * (self._scales[:self._size] * qscale[0])
+        else:
+            scores = self._matrix[:self._size] @ q
+        idx = np.argpartition(-scores, top_k - 1)[:top_k]
+        idx = idx[np.argsort(-scores[idx])]
+        return [(self._ids[i], float(scores[i]), self._payloads[self._ids[i]]) for i in idx]
@@ -0,0 +1,32 @@
+"""
+Dedicated simulation process for multi-worker deployments.
+
+Scale the request path across cores by running the app under gunicorn:
+
+    gunicorn main:app -k uvicorn.workers.UvicornWorker -w ${WEB_CONCURRENCY:-5}
+
+with this process alongside it:
+
+    REDIS_URL=redis://localhost:6379 python simulator.py
+
+This is the only process running simulate_sensors/ai_loop; each web
+worker subscribes to the `sensors` Redis channel (see main.redis_subscriber)
+and fans the published payload out to its own WebSocket clients, so chat
+and RAG requests are no longer starved by the simulation coroutines.
+"""
+
+import asyncio
+import os
+
+import redis.asyncio as aioredis
+
+import main
+
+
+async def run() -> None:
+    main.state.redis = aioredis.from_url(os.environ["REDIS_URL"])
+    await asyncio.gather(main.simulate_sensors(), main.ai_loop())
+
+
+if __name__ == "__main__":
+    asyncio.run(run())